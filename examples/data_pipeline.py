@@ -2,7 +2,20 @@
 Data pipeline example using Infrar SDK
 """
 from infrar.storage import upload, download, list_objects
+from concurrent.futures import ThreadPoolExecutor
 import os
+import tempfile
+
+# Connections in the generated client's pool; more workers than this
+# would just queue for a connection
+MAX_POOL_CONNECTIONS = 32
+
+# Number of files processed in parallel (transfers are I/O-bound);
+# tune per network with INFRAR_MAX_CONCURRENCY, up to MAX_POOL_CONNECTIONS
+CONCURRENCY = min(
+    int(os.environ.get('INFRAR_MAX_CONCURRENCY', '16')),
+    MAX_POOL_CONNECTIONS
+)
 
 def process_data_files():
     """Process data files from cloud storage"""
@@ -13,9 +26,18 @@ def process_data_files():
         prefix='raw/2024/'
     )
 
-    for file_info in input_files:
+    # Overlap downloads, processing and uploads across files
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        for _ in executor.map(handle_file, input_files):
+            pass
+
+def handle_file(file_info):
+    """Download, process and upload a single file"""
+    # Stage files in a scratch directory that is removed once uploaded,
+    # so large datasets don't accumulate in /tmp
+    with tempfile.TemporaryDirectory() as staging_dir:
         # Download file
-        local_path = f'/tmp/{os.path.basename(file_info["key"])}'
+        local_path = os.path.join(staging_dir, os.path.basename(file_info['key']))
         download(
             bucket='data-lake',
             source=file_info['key'],
@@ -31,7 +31,14 @@ func ExecuteCommandWithTimeout(timeout time.Duration, name string, args ...strin
 
 // ExecuteCommandWithStdin executes a command with stdin input
 func ExecuteCommandWithStdin(ctx context.Context, input string, name string, args ...string) (string, string, error) {
+	return ExecuteCommandWithStdinEnv(ctx, input, nil, name, args...)
+}
+
+// ExecuteCommandWithStdinEnv executes a command with stdin input and the
+// given environment (nil inherits the current process environment)
+func ExecuteCommandWithStdinEnv(ctx context.Context, input string, env []string, name string, args ...string) (string, string, error) {
 	cmd := exec.CommandContext(ctx, name, args...)
+	cmd.Env = env
 
 	var stdout, stderr bytes.Buffer
 	cmd.Stdout = &stdout
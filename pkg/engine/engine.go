@@ -2,6 +2,7 @@ package engine
 
 import (
 	"fmt"
+	"io"
 
 	"github.com/QodeSrl/infrar-engine/pkg/detector"
 	"github.com/QodeSrl/infrar-engine/pkg/generator"
@@ -28,6 +29,11 @@ func New() (*Engine, error) {
 		return nil, fmt.Errorf("failed to create parser: %w", err)
 	}
 
+	// Serve every parse from one long-lived Python process. If the daemon
+	// can't be started (e.g. no Unix socket support), or later can't be
+	// respawned, the parser falls back to starting an interpreter per parse.
+	_ = pythonParser.StartDaemon()
+
 	// Create detector
 	det := detector.NewDetector()
 
@@ -37,6 +43,7 @@ func New() (*Engine, error) {
 	// Create validator
 	val, err := validator.NewValidator()
 	if err != nil {
+		pythonParser.Close()
 		return nil, fmt.Errorf("failed to create validator: %w", err)
 	}
 
@@ -48,6 +55,22 @@ func New() (*Engine, error) {
 	}, nil
 }
 
+// Close stops the parser daemon started by New
+func (e *Engine) Close() error {
+	if closer, ok := e.parser.(io.Closer); ok {
+		return closer.Close()
+	}
+	return nil
+}
+
+// EnableParseCache caches parse results on disk under dir (the user's cache
+// directory if dir is empty), so unchanged sources are not parsed again
+func (e *Engine) EnableParseCache(dir string) {
+	if cacheable, ok := e.parser.(interface{ EnableCache(dir string) }); ok {
+		cacheable.EnableCache(dir)
+	}
+}
+
 // LoadRules loads transformation rules from a plugin directory
 func (e *Engine) LoadRules(pluginDir string, provider types.Provider, capability string) error {
 	loader := plugin.NewLoader(pluginDir)
@@ -15,6 +15,7 @@ func TestEngine_Transform_EndToEnd(t *testing.T) {
 	if err != nil {
 		t.Fatalf("Failed to create engine: %v", err)
 	}
+	defer eng.Close()
 
 	// Create temporary plugin directory with rules
 	tmpDir := t.TempDir()
@@ -89,6 +90,7 @@ func TestEngine_Transform_NoInfrarCalls(t *testing.T) {
 	if err != nil {
 		t.Fatalf("Failed to create engine: %v", err)
 	}
+	defer eng.Close()
 
 	sourceCode := `
 def hello():
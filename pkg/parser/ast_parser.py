@@ -7,9 +7,44 @@ of the AST for consumption by the Go-based transformation engine.
 """
 
 import ast
+import hashlib
 import json
+import mmap
+import os
+import random
 import sys
-from typing import Any, Dict, List, Optional
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import blake3
+except ImportError:  # blake3 is optional; fall back to hashlib.blake2b
+    blake3 = None
+
+# Module prefix of the Infrar SDK; calls that cannot resolve to it are
+# not reported to the engine
+INFRAR_PREFIX = "infrar"
+
+# Interned keys for the common positional argument indexes
+_ARG_KEYS = tuple(sys.intern(f"arg_{i}") for i in range(32))
+
+# On-disk cache of serialized parse results, keyed by source content.
+# Set INFRAR_AST_CACHE=0 to disable it.
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_EVICT_SAMPLE_RATE = 0.01
+
+# Identifies this parser build in cache keys, so that changes to the script
+# or to Python's grammar invalidate entries; computed once per process
+_PARSER_DIGEST = hashlib.blake2b(
+    sys.version.encode("utf-8") + b"\0" + Path(__file__).read_bytes(),
+    digest_size=32
+).digest()
 
 
 def get_value_type(value: Any) -> str:
@@ -34,141 +69,271 @@ def get_value_type(value: Any) -> str:
         return "unknown"
 
 
+def _extract_constant(node: ast.Constant) -> Dict[str, Any]:
+    return {"type": get_value_type(node.value), "value": node.value}
+
+
+def _extract_name(node: ast.Name) -> Dict[str, Any]:
+    return {"type": "variable", "value": node.id}
+
+
+def _extract_list(node: ast.List) -> Dict[str, Any]:
+    return {
+        "type": "list",
+        "value": [extract_value(elt) for elt in node.elts]
+    }
+
+
+def _extract_dict(node: ast.Dict) -> Dict[str, Any]:
+    return {
+        "type": "dict",
+        "value": {
+            extract_value(k)["value"]: extract_value(v)
+            for k, v in zip(node.keys, node.values)
+        }
+    }
+
+
+def _extract_unknown(node: Optional[ast.AST]) -> Dict[str, Any]:
+    return {"type": "unknown", "value": None}
+
+
+# Value extractors keyed by exact node type. Since Python 3.8 the parser
+# emits ast.Constant for all literals (ast.Str, ast.Num and
+# ast.NameConstant are only deprecated aliases), so no entries are needed
+# for the legacy node types.
+_EXTRACTORS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    ast.Constant: _extract_constant,
+    ast.Name: _extract_name,
+    ast.List: _extract_list,
+    ast.Dict: _extract_dict,
+}
+
+
 def extract_value(node: ast.AST) -> Dict[str, Any]:
     """Extract value from an AST node."""
-    if isinstance(node, ast.Constant):
-        # Python 3.8+
-        value_type = get_value_type(node.value)
-        return {
-            "type": value_type,
-            "value": node.value
-        }
-    elif isinstance(node, ast.Str):
-        # Python <3.8
-        return {"type": "string", "value": node.s}
-    elif isinstance(node, ast.Num):
-        # Python <3.8
-        return {"type": "number", "value": str(node.n)}
-    elif isinstance(node, ast.NameConstant):
-        # Python <3.8 (True, False, None)
-        return {"type": get_value_type(node.value), "value": node.value}
-    elif isinstance(node, ast.Name):
-        return {"type": "variable", "value": node.id}
-    elif isinstance(node, ast.List):
-        return {
-            "type": "list",
-            "value": [extract_value(elt) for elt in node.elts]
-        }
-    elif isinstance(node, ast.Dict):
+    return _EXTRACTORS.get(type(node), _extract_unknown)(node)
+
+
+class ImportInfo:
+    """An import statement, as reported to the engine."""
+
+    __slots__ = ("module", "names", "alias", "lineno")
+
+    def __init__(self, module: str, names: List[str], alias: str, lineno: int):
+        self.module = module
+        self.names = names
+        self.alias = alias
+        self.lineno = lineno
+
+    def to_json(self) -> Dict[str, Any]:
         return {
-            "type": "dict",
-            "value": {
-                extract_value(k)["value"]: extract_value(v)
-                for k, v in zip(node.keys, node.values)
-            }
+            "module": self.module,
+            "names": self.names,
+            "alias": self.alias,
+            "lineno": self.lineno,
         }
-    else:
-        return {"type": "unknown", "value": None}
-
-
-def extract_imports(tree: ast.Module) -> List[Dict[str, Any]]:
-    """Extract import statements from the AST."""
-    imports = []
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append({
-                    "module": alias.name,
-                    "names": [alias.name],
-                    "alias": alias.asname or "",
-                    "lineno": node.lineno
-                })
-
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            names = [alias.name for alias in node.names]
-            imports.append({
-                "module": module,
-                "names": names,
-                "alias": "",
-                "lineno": node.lineno
-            })
-
-    return imports
-
-
-def extract_calls(tree: ast.Module, source_lines: List[str]) -> List[Dict[str, Any]]:
-    """Extract function calls from the AST, focusing on potential Infrar SDK calls."""
-    calls = []
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            call_info = {
-                "lineno": node.lineno,
-                "col_offset": node.col_offset,
-                "function": None,
-                "module": None,
-                "arguments": {},
-            }
 
-            # Determine the function being called
-            if isinstance(node.func, ast.Name):
-                # Direct function call: upload(...)
-                call_info["function"] = node.func.id
 
-            elif isinstance(node.func, ast.Attribute):
-                # Attribute call: infrar.storage.upload(...)
-                # or storage.upload(...)
-                call_info["function"] = node.func.attr
+class CallInfo:
+    """A potential Infrar SDK call, as reported to the engine."""
 
-                # Try to extract the full module path
-                parts = []
-                current = node.func.value
-                while isinstance(current, ast.Attribute):
-                    parts.insert(0, current.attr)
-                    current = current.value
-                if isinstance(current, ast.Name):
-                    parts.insert(0, current.id)
-                    call_info["module"] = ".".join(parts)
+    __slots__ = (
+        "lineno", "col_offset", "end_lineno", "end_col_offset",
+        "function", "module", "arguments",
+    )
 
-            # Extract arguments
-            # Positional arguments
-            for i, arg in enumerate(node.args):
-                call_info["arguments"][f"arg_{i}"] = extract_value(arg)
+    def __init__(self, lineno: int, col_offset: int, end_lineno: int,
+                 end_col_offset: int, function: str, module: Optional[str],
+                 arguments: Dict[str, Any]):
+        self.lineno = lineno
+        self.col_offset = col_offset
+        self.end_lineno = end_lineno
+        self.end_col_offset = end_col_offset
+        self.function = function
+        self.module = module
+        self.arguments = arguments
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "lineno": self.lineno,
+            "col_offset": self.col_offset,
+            "end_lineno": self.end_lineno,
+            "end_col_offset": self.end_col_offset,
+            "function": self.function,
+            "module": self.module,
+            "arguments": self.arguments,
+        }
 
-            # Keyword arguments
-            for keyword in node.keywords:
-                call_info["arguments"][keyword.arg] = extract_value(keyword.value)
 
-            # Extract source code snippet
-            if 0 <= node.lineno - 1 < len(source_lines):
-                call_info["source_code"] = source_lines[node.lineno - 1].strip()
+class _Collector:
+    """
+    Collect imports and function calls in a single pass over the AST.
 
-            calls.append(call_info)
+    The tree is walked iteratively, dispatching on the node type, so deeply
+    nested expressions (long "+" chains, if/elif ladders) can't exhaust the
+    interpreter's recursion limit.
 
-    return calls
+    Calls are only resolved to their callee during the pass; arguments are
+    extracted afterwards, once the imports are known, and only for calls
+    that can be Infrar SDK calls (see sdk_calls).
+    """
 
+    def __init__(self):
+        self.imports: List[ImportInfo] = []
+        self._calls: List[Tuple[ast.Call, str, Optional[str]]] = []
+        self._handlers: Dict[type, Callable[[Any], None]] = {
+            ast.Import: self._add_import,
+            ast.ImportFrom: self._add_import_from,
+            ast.Call: self._add_call,
+        }
 
-def parse_python_code(source_code: str) -> Dict[str, Any]:
+    def collect(self, tree: ast.AST) -> None:
+        handlers = self._handlers
+        for node in ast.walk(tree):
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(node)
+
+    def _add_import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(ImportInfo(
+                module=alias.name,
+                names=[alias.name],
+                alias=alias.asname or "",
+                lineno=node.lineno
+            ))
+
+    def _add_import_from(self, node: ast.ImportFrom) -> None:
+        self.imports.append(ImportInfo(
+            module=node.module or "",
+            names=[alias.name for alias in node.names],
+            alias="",
+            lineno=node.lineno
+        ))
+
+    def _add_call(self, node: ast.Call) -> None:
+        # Determine the function being called (ast node types are never
+        # subclassed, so an identity check on the type is enough)
+        func = node.func
+        func_type = type(func)
+        if func_type is ast.Name:
+            # Direct function call: upload(...)
+            self._calls.append((node, func.id, None))
+
+        elif func_type is ast.Attribute:
+            # Attribute call: infrar.storage.upload(...)
+            # or storage.upload(...)
+            module = None
+
+            # Try to extract the full module path
+            parts = []
+            current = func.value
+            while type(current) is ast.Attribute:
+                parts.append(current.attr)
+                current = current.value
+            if type(current) is ast.Name:
+                parts.append(current.id)
+                module = ".".join(reversed(parts))
+
+            self._calls.append((node, func.attr, module))
+
+    def sdk_names(self) -> Set[str]:
+        """
+        Names that can refer to Infrar SDK symbols or modules, mirroring
+        the import map built by the Go detector (plus import aliases).
+        """
+        names = set()
+        for imp in self.imports:
+            module = imp.module
+            if not module.startswith(INFRAR_PREFIX):
+                continue
+
+            names.update(name for name in imp.names if name != "*")
+            if imp.alias:
+                names.add(imp.alias)
+
+            # Direct module import: import infrar.storage
+            if not imp.names or imp.names == [module]:
+                names.add(module.rsplit(".", 1)[-1])
+        return names
+
+    def sdk_calls(self) -> List[CallInfo]:
+        """
+        Build call records for the calls that can be Infrar SDK calls,
+        skipping ones the detector would discard anyway.
+        """
+        names = self.sdk_names()
+        return [
+            _call_info(node, function, module)
+            for node, function, module in self._calls
+            if _is_sdk_call(function, module, names)
+        ]
+
+
+def _is_sdk_call(function: str, module: Optional[str], names: Set[str]) -> bool:
+    """Whether a call can resolve to the Infrar SDK, given its imported names."""
+    if module is None:
+        return function in names
+    return module.startswith(INFRAR_PREFIX) or module.split(".", 1)[0] in names
+
+
+def _arg_key(index: int) -> str:
+    """Key for a positional argument, shared across calls for small indexes."""
+    if index < len(_ARG_KEYS):
+        return _ARG_KEYS[index]
+    return f"arg_{index}"
+
+
+def _call_info(node: ast.Call, function: str, module: Optional[str]) -> CallInfo:
+    """Build the record reported to the engine for a call."""
+    # Extract arguments
+    # Positional arguments
+    arguments = {_arg_key(i): extract_value(arg) for i, arg in enumerate(node.args)}
+
+    # Keyword arguments
+    for keyword in node.keywords:
+        arguments[keyword.arg] = extract_value(keyword.value)
+
+    # The engine already holds the source, so only the call's span is
+    # reported and snippets are sliced on the Go side
+    return CallInfo(
+        lineno=node.lineno,
+        col_offset=node.col_offset,
+        end_lineno=node.end_lineno,
+        end_col_offset=node.end_col_offset,
+        function=function,
+        module=module,
+        arguments=arguments,
+    )
+
+
+def parse_python_code(source_code: Union[str, bytes], filename: str = "<unknown>") -> Dict[str, Any]:
     """
     Parse Python source code and return JSON representation.
 
     Args:
-        source_code: Python source code as string
+        source_code: Python source code as a string, or as bytes (or any
+            buffer) whose encoding is detected from a BOM or coding cookie
+        filename: Name reported in syntax errors
 
     Returns:
         Dictionary with AST information
     """
     try:
-        tree = ast.parse(source_code)
-        source_lines = source_code.split('\n')
+        # Equivalent to ast.parse(), without inheriting the compiler flags
+        # of this script
+        tree = compile(
+            source_code, filename, "exec",
+            flags=ast.PyCF_ONLY_AST, dont_inherit=True
+        )
+        collector = _Collector()
+        collector.collect(tree)
 
         result = {
             "language": "python",
-            "imports": extract_imports(tree),
-            "calls": extract_calls(tree, source_lines),
-            "source_code": source_code,
+            "imports": collector.imports,
+            "calls": collector.sdk_calls(),
             "success": True,
             "error": None
         }
@@ -196,18 +361,215 @@ def parse_python_code(source_code: str) -> Dict[str, Any]:
         }
 
 
+def _encode_record(obj: Any) -> Dict[str, Any]:
+    """Serialization hook for the ImportInfo and CallInfo records."""
+    if type(obj) is ImportInfo or type(obj) is CallInfo:
+        return obj.to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_result(result: Dict[str, Any]) -> bytes:
+    """Serialize a parse result to JSON, using orjson when it is available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                result,
+                default=_encode_record,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the stdlib handles
+            pass
+    return json.dumps(result, indent=2, default=_encode_record).encode("utf-8")
+
+
+def _cache_dir() -> Optional[Path]:
+    """Return the parse cache directory, or None if caching is disabled."""
+    if os.environ.get("INFRAR_AST_CACHE", "1") == "0":
+        return None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(base).expanduser() / "infrar" / "ast"
+
+
+def _cache_key(source: bytes, filename: str) -> str:
+    """
+    Hash the source together with _PARSER_DIGEST. The filename is included
+    because it appears in syntax error messages.
+    """
+    hasher = blake3.blake3() if blake3 is not None else hashlib.blake2b(digest_size=32)
+    hasher.update(_PARSER_DIGEST)
+    hasher.update(filename.encode("utf-8", "surrogatepass") + b"\0")
+    hasher.update(source)
+    return hasher.hexdigest()
+
+
+def _evict_cache(cache_dir: Path) -> None:
+    """Remove least recently used entries until the cache fits CACHE_MAX_BYTES."""
+    entries = []
+    total = 0
+    for path in cache_dir.glob("*/*"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def parse_to_json(source_code: bytes, filename: str = "<unknown>") -> bytes:
+    """
+    Parse Python source code and return the serialized result, reusing a
+    cached result for source that has been parsed before.
+    """
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return dump_result(parse_python_code(source_code, filename))
+
+    key = _cache_key(source_code, filename)
+    cache_path = cache_dir / key[:2] / key[2:]
+    try:
+        output = cache_path.read_bytes()
+        # Refresh the mtime so eviction keeps recently used entries
+        os.utime(cache_path)
+        return output
+    except OSError:
+        pass
+
+    result = parse_python_code(source_code, filename)
+    output = dump_result(result)
+
+    # Only deterministic outcomes are cached; other failures (e.g.
+    # MemoryError) may not recur on the next run
+    if not (result["success"] or result["error"]["type"] == "SyntaxError"):
+        return output
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(output)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if random.random() < CACHE_EVICT_SAMPLE_RATE:
+            _evict_cache(cache_dir)
+    except OSError:
+        # The cache is best-effort; a read-only home must not break parsing
+        pass
+
+    return output
+
+
+# Daemon frames in both directions are a little-endian uint32 length
+# followed by that many bytes; a bare header holding DAEMON_PING is a
+# liveness check and is echoed back.
+DAEMON_PING = 0xFFFFFFFF
+
+
+def _exit_on_stdin_eof() -> None:
+    """Exit once the parent closes our stdin, so the daemon never outlives it."""
+    while sys.stdin.buffer.read(65536):
+        pass
+    os._exit(0)
+
+
+def serve(socket_path: str) -> None:
+    """
+    Run as a persistent daemon, serving parse requests on a Unix domain
+    socket so the interpreter start-up cost is paid once per engine run
+    rather than once per file.
+    """
+    # Imported and defined here rather than at module level, so one-shot
+    # parses don't pay for them (and socketserver only provides the Unix
+    # server classes on platforms with AF_UNIX)
+    import socketserver
+    import struct
+    import threading
+
+    frame_header = struct.Struct("<I")
+
+    class DaemonHandler(socketserver.StreamRequestHandler):
+        """Serve parse requests on one connection until the client disconnects."""
+
+        def handle(self) -> None:
+            while True:
+                header = self.rfile.read(frame_header.size)
+                if len(header) < frame_header.size:
+                    return
+
+                (length,) = frame_header.unpack(header)
+                if length == DAEMON_PING:
+                    self.wfile.write(header)
+                    continue
+
+                source_code = self.rfile.read(length)
+                if len(source_code) < length:
+                    return
+
+                try:
+                    output = parse_to_json(source_code, "<stdin>")
+                except Exception as e:
+                    # Report the failure on this request instead of dropping
+                    # the connection, which the engine would treat as a dead
+                    # daemon
+                    output = dump_result({
+                        "success": False,
+                        "error": {
+                            "type": type(e).__name__,
+                            "message": str(e)
+                        }
+                    })
+                self.wfile.write(frame_header.pack(len(output)))
+                self.wfile.write(output)
+
+    class DaemonServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    threading.Thread(target=_exit_on_stdin_eof, daemon=True).start()
+
+    with DaemonServer(socket_path, DaemonHandler) as server:
+        server.serve_forever()
+
+
 def main():
     """Main entry point - reads from stdin, outputs JSON to stdout."""
+    if len(sys.argv) > 2 and sys.argv[1] == "--daemon":
+        serve(sys.argv[2])
+        return
+
+    # Source is kept as raw bytes: compile() detects the encoding itself,
+    # so there is no need to decode (and copy) it up front
     if len(sys.argv) > 1:
-        # Read from file if provided
-        with open(sys.argv[1], 'r') as f:
-            source_code = f.read()
+        # Read from file if provided, mapping it rather than copying it
+        filename = sys.argv[1]
+        with open(filename, 'rb') as f:
+            try:
+                source_code = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                source_code = b""
     else:
         # Read from stdin
-        source_code = sys.stdin.read()
+        filename = "<stdin>"
+        source_code = sys.stdin.buffer.read()
 
-    result = parse_python_code(source_code)
-    print(json.dumps(result, indent=2))
+    sys.stdout.buffer.write(parse_to_json(source_code, filename))
+    sys.stdout.buffer.write(b"\n")
 
 
 if __name__ == "__main__":
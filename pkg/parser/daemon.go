@@ -0,0 +1,272 @@
+package parser
+
+import (
+	"bytes"
+	"context"
+	"encoding/binary"
+	"errors"
+	"fmt"
+	"io"
+	"math"
+	"net"
+	"os"
+	"os/exec"
+	"path/filepath"
+	"sync"
+	"time"
+)
+
+// daemonPing is the frame length that marks a liveness check (see ast_parser.py)
+const daemonPing = math.MaxUint32
+
+// pythonDaemon manages a long-lived ast_parser.py process that serves parse
+// requests over a Unix domain socket, so the Python start-up cost is paid
+// once instead of once per parsed file.
+//
+// Frames in both directions are a little-endian uint32 length followed by
+// that many bytes.
+type pythonDaemon struct {
+	pythonExecutable string
+	parserScriptPath string
+	startTimeout     time.Duration
+
+	mu     sync.Mutex
+	env    []string
+	dir    string
+	cmd    *exec.Cmd
+	stdin  io.WriteCloser
+	conn   net.Conn
+	exited chan struct{}
+	stderr bytes.Buffer
+}
+
+// newPythonDaemon creates a daemon handle; the process is started lazily
+func newPythonDaemon(pythonExecutable, parserScriptPath string, env []string, startTimeout time.Duration) *pythonDaemon {
+	return &pythonDaemon{
+		pythonExecutable: pythonExecutable,
+		parserScriptPath: parserScriptPath,
+		startTimeout:     startTimeout,
+		env:              env,
+	}
+}
+
+// Start launches the daemon process if it is not already running
+func (d *pythonDaemon) Start() error {
+	d.mu.Lock()
+	defer d.mu.Unlock()
+
+	if d.alive() {
+		return nil
+	}
+	d.stop()
+	return d.start()
+}
+
+// Parse sends source code to the daemon and returns the JSON parse result.
+// A crashed daemon is respawned, and a request that fails on a dead
+// connection is retried once.
+func (d *pythonDaemon) Parse(ctx context.Context, sourceCode string) ([]byte, error) {
+	if uint64(len(sourceCode)) >= daemonPing {
+		return nil, fmt.Errorf("source code too large for parser daemon")
+	}
+
+	d.mu.Lock()
+	defer d.mu.Unlock()
+
+	var lastErr error
+	for attempt := 0; attempt < 2; attempt++ {
+		if !d.alive() {
+			d.stop()
+			if err := d.start(); err != nil {
+				return nil, err
+			}
+		}
+
+		_, output, err := d.exchange(ctx, uint32(len(sourceCode)), []byte(sourceCode))
+		if err == nil {
+			return output, nil
+		}
+
+		lastErr = err
+		d.stop()
+
+		// Don't retry requests that simply ran out of time
+		if ctx.Err() != nil || errors.Is(err, os.ErrDeadlineExceeded) {
+			break
+		}
+	}
+
+	return nil, fmt.Errorf("parser daemon request failed: %w", lastErr)
+}
+
+// Ping checks that the daemon is running and answering requests
+func (d *pythonDaemon) Ping(ctx context.Context) error {
+	d.mu.Lock()
+	defer d.mu.Unlock()
+
+	if !d.alive() {
+		return fmt.Errorf("parser daemon is not running")
+	}
+	return d.ping(ctx)
+}
+
+// SetEnv changes the daemon's environment. A running process is stopped
+// and respawned with the new environment by the next request.
+func (d *pythonDaemon) SetEnv(env []string) {
+	d.mu.Lock()
+	defer d.mu.Unlock()
+
+	d.env = env
+	d.stop()
+}
+
+// Close stops the daemon process and removes its socket
+func (d *pythonDaemon) Close() {
+	d.mu.Lock()
+	defer d.mu.Unlock()
+
+	d.stop()
+}
+
+// start launches the daemon and connects to it. The caller must hold d.mu.
+func (d *pythonDaemon) start() error {
+	dir, err := os.MkdirTemp("", "infrar-parser-")
+	if err != nil {
+		return fmt.Errorf("failed to create parser daemon directory: %w", err)
+	}
+	socketPath := filepath.Join(dir, "parser.sock")
+
+	cmd := exec.Command(d.pythonExecutable, d.parserScriptPath, "--daemon", socketPath)
+	cmd.Env = d.env
+	d.stderr.Reset()
+	cmd.Stderr = &d.stderr
+
+	// The daemon exits when this pipe closes, so it never outlives the engine
+	stdin, err := cmd.StdinPipe()
+	if err != nil {
+		os.RemoveAll(dir)
+		return fmt.Errorf("failed to create parser daemon stdin: %w", err)
+	}
+
+	if err := cmd.Start(); err != nil {
+		os.RemoveAll(dir)
+		return fmt.Errorf("failed to start parser daemon: %w", err)
+	}
+
+	exited := make(chan struct{})
+	go func() {
+		cmd.Wait()
+		close(exited)
+	}()
+
+	d.dir = dir
+	d.cmd = cmd
+	d.stdin = stdin
+	d.exited = exited
+
+	ctx, cancel := context.WithTimeout(context.Background(), d.startTimeout)
+	defer cancel()
+
+	// Wait for the socket to accept connections and answer a ping
+	for {
+		conn, err := net.Dial("unix", socketPath)
+		if err == nil {
+			d.conn = conn
+			if err := d.ping(ctx); err != nil {
+				d.stop()
+				return fmt.Errorf("parser daemon did not answer ping: %w", err)
+			}
+			return nil
+		}
+
+		select {
+		case <-exited:
+			stderr := d.stderr.String()
+			d.stop()
+			return fmt.Errorf("parser daemon exited during start-up\nstderr: %s", stderr)
+		case <-ctx.Done():
+			d.stop()
+			return fmt.Errorf("timed out waiting for parser daemon: %w", err)
+		case <-time.After(10 * time.Millisecond):
+		}
+	}
+}
+
+// stop kills the daemon process and cleans up. The caller must hold d.mu.
+func (d *pythonDaemon) stop() {
+	if d.conn != nil {
+		d.conn.Close()
+		d.conn = nil
+	}
+
+	if d.cmd != nil {
+		d.stdin.Close()
+		d.cmd.Process.Kill()
+		<-d.exited
+		d.cmd = nil
+		d.stdin = nil
+	}
+
+	if d.dir != "" {
+		os.RemoveAll(d.dir)
+		d.dir = ""
+	}
+}
+
+// alive reports whether the daemon process is running. The caller must hold d.mu.
+func (d *pythonDaemon) alive() bool {
+	if d.cmd == nil || d.conn == nil {
+		return false
+	}
+
+	select {
+	case <-d.exited:
+		return false
+	default:
+		return true
+	}
+}
+
+// ping sends a liveness check frame. The caller must hold d.mu.
+func (d *pythonDaemon) ping(ctx context.Context) error {
+	header, _, err := d.exchange(ctx, daemonPing, nil)
+	if err != nil {
+		return err
+	}
+	if header != daemonPing {
+		return fmt.Errorf("unexpected ping response")
+	}
+	return nil
+}
+
+// exchange writes one frame and reads the response frame. The caller must hold d.mu.
+func (d *pythonDaemon) exchange(ctx context.Context, length uint32, body []byte) (uint32, []byte, error) {
+	deadline, _ := ctx.Deadline()
+	if err := d.conn.SetDeadline(deadline); err != nil {
+		return 0, nil, err
+	}
+
+	header := make([]byte, 4)
+	binary.LittleEndian.PutUint32(header, length)
+
+	frame := net.Buffers{header, body}
+	if _, err := frame.WriteTo(d.conn); err != nil {
+		return 0, nil, err
+	}
+
+	if _, err := io.ReadFull(d.conn, header); err != nil {
+		return 0, nil, err
+	}
+
+	respLength := binary.LittleEndian.Uint32(header)
+	if respLength == daemonPing {
+		return respLength, nil, nil
+	}
+
+	resp := make([]byte, respLength)
+	if _, err := io.ReadFull(d.conn, resp); err != nil {
+		return 0, nil, err
+	}
+
+	return respLength, resp, nil
+}
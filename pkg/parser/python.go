@@ -7,6 +7,7 @@ import (
 	"os"
 	"path/filepath"
 	"runtime"
+	"strings"
 	"time"
 
 	"github.com/QodeSrl/infrar-engine/internal/util"
@@ -18,16 +19,17 @@ type PythonParser struct {
 	pythonExecutable string
 	parserScriptPath string
 	timeout          time.Duration
+	cacheEnv         []string
+	daemon           *pythonDaemon
 }
 
 // pythonParseResult represents the JSON output from the Python parser
 type pythonParseResult struct {
-	Language   string                   `json:"language"`
-	Imports    []types.Import           `json:"imports"`
-	Calls      []pythonCall             `json:"calls"`
-	SourceCode string                   `json:"source_code"`
-	Success    bool                     `json:"success"`
-	Error      *pythonError             `json:"error,omitempty"`
+	Language string         `json:"language"`
+	Imports  []types.Import `json:"imports"`
+	Calls    []pythonCall   `json:"calls"`
+	Success  bool           `json:"success"`
+	Error    *pythonError   `json:"error,omitempty"`
 }
 
 // pythonCall is an alias for the exported PythonCall type
@@ -35,11 +37,11 @@ type pythonCall = PythonCall
 
 // pythonError represents an error from Python parser
 type pythonError struct {
-	Type    string `json:"type"`
-	Message string `json:"message"`
-	LineNumber int `json:"lineno,omitempty"`
-	Offset  int    `json:"offset,omitempty"`
-	Text    string `json:"text,omitempty"`
+	Type       string `json:"type"`
+	Message    string `json:"message"`
+	LineNumber int    `json:"lineno,omitempty"`
+	Offset     int    `json:"offset,omitempty"`
+	Text       string `json:"text,omitempty"`
 }
 
 // NewPythonParser creates a new Python parser
@@ -66,21 +68,84 @@ func NewPythonParser() (*PythonParser, error) {
 		pythonExecutable: pythonExec,
 		parserScriptPath: parserScriptPath,
 		timeout:          30 * time.Second,
+		cacheEnv:         []string{"INFRAR_AST_CACHE=0"},
 	}, nil
 }
 
+// EnableCache makes the parser reuse results from an on-disk cache keyed by
+// source content, stored under dir (the user's cache directory if dir is
+// empty). The cache is off by default, so nothing is written outside the
+// caller's control unless asked for.
+func (p *PythonParser) EnableCache(dir string) {
+	p.cacheEnv = []string{"INFRAR_AST_CACHE=1"}
+	if dir != "" {
+		p.cacheEnv = append(p.cacheEnv, "XDG_CACHE_HOME="+dir)
+	}
+
+	if p.daemon != nil {
+		p.daemon.SetEnv(p.env())
+	}
+}
+
+// env returns the environment for parser processes
+func (p *PythonParser) env() []string {
+	return append(os.Environ(), p.cacheEnv...)
+}
+
+// StartDaemon switches the parser to a persistent Python process that
+// serves parse requests over a Unix domain socket, instead of starting a
+// new interpreter for every Parse call. If the daemon later stops working
+// and can't be respawned, Parse falls back to an interpreter per call.
+// Call Close when done.
+func (p *PythonParser) StartDaemon() error {
+	if p.daemon != nil {
+		return nil
+	}
+
+	d := newPythonDaemon(p.pythonExecutable, p.parserScriptPath, p.env(), p.timeout)
+	if err := d.Start(); err != nil {
+		return err
+	}
+
+	p.daemon = d
+	return nil
+}
+
+// Close stops the parser daemon, if one was started
+func (p *PythonParser) Close() error {
+	if p.daemon != nil {
+		p.daemon.Close()
+		p.daemon = nil
+	}
+	return nil
+}
+
 // Parse implements the Parser interface
 func (p *PythonParser) Parse(sourceCode string) (*types.AST, error) {
 	ctx, cancel := context.WithTimeout(context.Background(), p.timeout)
 	defer cancel()
 
-	// Execute Python parser script
-	stdout, stderr, err := util.ExecuteCommandWithStdin(
-		ctx,
-		sourceCode,
-		p.pythonExecutable,
-		p.parserScriptPath,
-	)
+	var stdout, stderr string
+	var err error
+
+	if p.daemon != nil {
+		// Send the source to the long-lived parser process
+		var output []byte
+		output, err = p.daemon.Parse(ctx, sourceCode)
+		stdout = string(output)
+	}
+
+	// Without a usable daemon, run the parser script once for this call
+	// (unless the daemon request already used up the time budget)
+	if p.daemon == nil || (err != nil && ctx.Err() == nil) {
+		stdout, stderr, err = util.ExecuteCommandWithStdinEnv(
+			ctx,
+			sourceCode,
+			p.env(),
+			p.pythonExecutable,
+			p.parserScriptPath,
+		)
+	}
 
 	if err != nil {
 		return nil, &types.TransformationError{
@@ -116,6 +181,10 @@ func (p *PythonParser) Parse(sourceCode string) (*types.AST, error) {
 		}
 	}
 
+	// The Python side only reports call positions; slice the snippets
+	// from the source we already hold
+	fillCallSourceCode(result.Calls, sourceCode)
+
 	// Convert to types.AST
 	ast := &types.AST{
 		Language:   types.LanguagePython,
@@ -129,6 +198,21 @@ func (p *PythonParser) Parse(sourceCode string) (*types.AST, error) {
 	return ast, nil
 }
 
+// fillCallSourceCode sets each call's SourceCode to its first source line
+func fillCallSourceCode(calls []pythonCall, sourceCode string) {
+	if len(calls) == 0 {
+		return
+	}
+
+	lines := strings.Split(sourceCode, "\n")
+	for i := range calls {
+		idx := calls[i].LineNumber - 1
+		if idx >= 0 && idx < len(lines) {
+			calls[i].SourceCode = strings.TrimSpace(lines[idx])
+		}
+	}
+}
+
 // ParseFile implements the Parser interface
 func (p *PythonParser) ParseFile(filepath string) (*types.AST, error) {
 	content, err := os.ReadFile(filepath)
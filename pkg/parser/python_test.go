@@ -1,8 +1,14 @@
 package parser
 
 import (
+	"context"
+	"os"
+	"path/filepath"
+	"strings"
 	"testing"
+	"time"
 
+	"github.com/QodeSrl/infrar-engine/internal/util"
 	"github.com/QodeSrl/infrar-engine/pkg/types"
 )
 
@@ -126,6 +132,16 @@ upload(bucket='my-bucket', source='file.txt', destination='remote.txt')
 			if call.Arguments["source"].Value != "file.txt" {
 				t.Errorf("Expected source='file.txt', got %v", call.Arguments["source"].Value)
 			}
+
+			// Check the snippet is sliced from the original source
+			wantSource := "upload(bucket='my-bucket', source='file.txt', destination='remote.txt')"
+			if call.SourceCode != wantSource {
+				t.Errorf("Expected source code %q, got %q", wantSource, call.SourceCode)
+			}
+
+			if call.EndLineNumber != call.LineNumber {
+				t.Errorf("Expected end line %d, got %d", call.LineNumber, call.EndLineNumber)
+			}
 		}
 	}
 
@@ -133,3 +149,220 @@ upload(bucket='my-bucket', source='file.txt', destination='remote.txt')
 		t.Error("Did not find upload() call")
 	}
 }
+
+func TestPythonParser_SkipsNonInfrarCalls(t *testing.T) {
+	parser, err := NewPythonParser()
+	if err != nil {
+		t.Fatalf("Failed to create parser: %v", err)
+	}
+
+	code := `
+import os
+from infrar.storage import upload
+
+path = os.path.join('/tmp', 'file.txt')
+print(path)
+upload(bucket='my-bucket', source=path, destination='remote.txt')
+`
+
+	ast, err := parser.Parse(code)
+	if err != nil {
+		t.Fatalf("Failed to parse code: %v", err)
+	}
+
+	calls, ok := ast.Metadata["calls"].([]pythonCall)
+	if !ok {
+		t.Fatal("No calls found in metadata")
+	}
+
+	if len(calls) != 1 {
+		t.Fatalf("Expected 1 call, got %d", len(calls))
+	}
+
+	if calls[0].Function != "upload" {
+		t.Errorf("Expected upload() call, got %s()", calls[0].Function)
+	}
+}
+
+func TestPythonParser_DeeplyNestedCode(t *testing.T) {
+	parser, err := NewPythonParser()
+	if err != nil {
+		t.Fatalf("Failed to create parser: %v", err)
+	}
+
+	// A long "+" chain nests 500 BinOp nodes deep
+	code := "from infrar.storage import upload\n" +
+		"s = " + strings.Repeat(`"x" + `, 499) + `"x"` + "\n" +
+		"upload(bucket='my-bucket', source=s, destination='remote.txt')\n"
+
+	ast, err := parser.Parse(code)
+	if err != nil {
+		t.Fatalf("Failed to parse deeply nested code: %v", err)
+	}
+
+	calls, ok := ast.Metadata["calls"].([]pythonCall)
+	if !ok || len(calls) != 1 {
+		t.Fatalf("Expected 1 call, got %v", ast.Metadata["calls"])
+	}
+}
+
+func TestPythonParser_Daemon(t *testing.T) {
+	parser, err := NewPythonParser()
+	if err != nil {
+		t.Fatalf("Failed to create parser: %v", err)
+	}
+
+	if err := parser.StartDaemon(); err != nil {
+		t.Fatalf("Failed to start daemon: %v", err)
+	}
+	defer parser.Close()
+
+	code := `
+from infrar.storage import upload
+
+upload(bucket='my-bucket', source='file.txt', destination='remote.txt')
+`
+
+	for i := 0; i < 3; i++ {
+		ast, err := parser.Parse(code)
+		if err != nil {
+			t.Fatalf("Parse %d failed: %v", i, err)
+		}
+
+		if len(ast.Imports) != 1 {
+			t.Errorf("Parse %d: expected 1 import, got %d", i, len(ast.Imports))
+		}
+	}
+
+	if _, err := parser.Parse("def invalid syntax here"); err == nil {
+		t.Error("Expected syntax error but got none")
+	}
+
+	// A request the parser can't serialize is reported as an error without
+	// taking the daemon down
+	pid := parser.daemon.cmd.Process.Pid
+	if _, err := parser.Parse("from infrar.storage import upload\nupload(b'x')\n"); err == nil {
+		t.Error("Expected error for unserializable argument but got none")
+	}
+	if parser.daemon.cmd.Process.Pid != pid {
+		t.Error("Daemon was respawned after a request-level error")
+	}
+
+	// A crashed daemon should be respawned transparently
+	parser.daemon.cmd.Process.Kill()
+	<-parser.daemon.exited
+
+	if _, err := parser.Parse(code); err != nil {
+		t.Fatalf("Parse after daemon crash failed: %v", err)
+	}
+
+	if err := parser.daemon.Ping(context.Background()); err != nil {
+		t.Errorf("Ping failed: %v", err)
+	}
+
+	// If the daemon can't be respawned, parses run in a one-off interpreter
+	parser.daemon.Close()
+	parser.daemon.parserScriptPath = filepath.Join(t.TempDir(), "missing.py")
+
+	if _, err := parser.Parse(code); err != nil {
+		t.Errorf("Parse without a working daemon failed: %v", err)
+	}
+}
+
+// runParserScript runs ast_parser.py once, in the parser's environment, and
+// returns its raw output
+func runParserScript(t *testing.T, parser *PythonParser, code string) string {
+	t.Helper()
+
+	ctx, cancel := context.WithTimeout(context.Background(), 30*time.Second)
+	defer cancel()
+
+	stdout, stderr, err := util.ExecuteCommandWithStdinEnv(ctx, code, parser.env(), parser.pythonExecutable, parser.parserScriptPath)
+	if err != nil {
+		t.Fatalf("Parser script failed: %v\nstderr: %s", err, stderr)
+	}
+	return stdout
+}
+
+// cachedFiles lists the entries in the parser cache under cacheHome
+func cachedFiles(t *testing.T, cacheHome string) []string {
+	t.Helper()
+
+	files, err := filepath.Glob(filepath.Join(cacheHome, "infrar", "ast", "*", "*"))
+	if err != nil {
+		t.Fatalf("Failed to list cache: %v", err)
+	}
+	return files
+}
+
+func TestPythonParser_Cache(t *testing.T) {
+	parser, err := NewPythonParser()
+	if err != nil {
+		t.Fatalf("Failed to create parser: %v", err)
+	}
+
+	cacheHome := t.TempDir()
+	parser.EnableCache(cacheHome)
+
+	code := `
+from infrar.storage import upload
+
+upload(bucket='my-bucket', source='file.txt', destination='remote.txt')
+`
+
+	// Miss: the result is computed and stored
+	miss := runParserScript(t, parser, code)
+	files := cachedFiles(t, cacheHome)
+	if len(files) != 1 {
+		t.Fatalf("Expected 1 cache entry after a miss, got %d", len(files))
+	}
+
+	// Hit: the stored result is returned unchanged
+	hit := runParserScript(t, parser, code)
+	if hit != miss {
+		t.Errorf("Cache hit output differs from miss output:\nmiss: %s\nhit: %s", miss, hit)
+	}
+
+	// Make sure the second run really was served from the cache
+	marker := `{"marker": true}`
+	if err := os.WriteFile(files[0], []byte(marker), 0o644); err != nil {
+		t.Fatalf("Failed to rewrite cache entry: %v", err)
+	}
+	if out := runParserScript(t, parser, code); out != marker+"\n" {
+		t.Errorf("Expected output from cache entry, got %q", out)
+	}
+
+	// The daemon uses the same cache
+	if err := parser.StartDaemon(); err != nil {
+		t.Fatalf("Failed to start daemon: %v", err)
+	}
+	defer parser.Close()
+
+	if _, err := parser.Parse(code); err == nil {
+		t.Error("Expected the daemon to return the rewritten cache entry")
+	}
+}
+
+func TestPythonParser_CacheDisabled(t *testing.T) {
+	parser, err := NewPythonParser()
+	if err != nil {
+		t.Fatalf("Failed to create parser: %v", err)
+	}
+
+	// The cache is off unless enabled, even where the user has a cache directory
+	cacheHome := t.TempDir()
+	t.Setenv("XDG_CACHE_HOME", cacheHome)
+
+	runParserScript(t, parser, `from infrar.storage import upload`)
+	if _, err := parser.Parse(`from infrar.storage import upload`); err != nil {
+		t.Fatalf("Failed to parse code: %v", err)
+	}
+
+	entries, err := os.ReadDir(cacheHome)
+	if err != nil {
+		t.Fatalf("Failed to read cache directory: %v", err)
+	}
+	if len(entries) != 0 {
+		t.Errorf("Expected no cache writes by default, found %d entries", len(entries))
+	}
+}